@@ -1,12 +1,27 @@
 #! /usr/bin/env python3
 
+import glob
+import hashlib
+import json
 import os
+import platform
+import re
 import shlex
+import shutil
 import subprocess
 import sys
+import sysconfig
+from collections.abc import Callable, Iterable
+from distutils._macos_compat import compiler_fixup
+from distutils.ccompiler import gen_preprocess_options
 
-from pybind11.setup_helpers import Pybind11Extension, build_ext
-from setuptools import find_packages, setup
+from pybind11.setup_helpers import (
+    ParallelCompile,
+    Pybind11Extension,
+    build_ext,
+)
+from setuptools import setup
+from setuptools.command.build_py import build_py
 
 
 class MapnikBuildConfig:
@@ -17,29 +32,128 @@ class MapnikBuildConfig:
     (pkg-config) inside this class, not at module import time.
     """
 
-    def __init__(self, pkg_name: str = "libmapnik"):
+    # Discovery results persisted by the build cache (see `discover`).
+    _CACHE_FIELDS = (
+        "linkflags",
+        "extra_comp_args",
+        "mapnik_lib_path",
+        "input_plugin_path",
+        "font_path",
+    )
+
+    def __init__(
+        self, pkg_name: str = "libmapnik", cache_file: str = ".mapnik_build.cache"
+    ):
         self.pkg_name = pkg_name
+        self.cache_file = cache_file
         self.linkflags: list[str] = []
         self.extra_comp_args: list[str] = []
+        # Mirrors extra_comp_args for O(1) membership tests.
+        self._comp_args_set: set[str] = set()
         self.mapnik_lib_path: str = ""
         self.input_plugin_path: str = ""
         self.font_path: str = ""
+        self.discovered = False
+        self._brew_prefix_value: str | None = None
+        self._executables: dict[str, str] = {}
+        # Every .pc file `_read_pc_files` loaded, checked by the build cache.
+        self._pc_files: list[str] = []
+        # False once discovery used inputs the build cache can't track.
+        self._cacheable = True
 
     @staticmethod
-    def _check_output(args: list[str]) -> str:
-        output = subprocess.check_output(args).decode()
+    def _tool_env() -> dict[str, str]:
+        # The C locale keeps tool output plain ASCII, independent of the user's locale.
+        return {**os.environ, "LC_ALL": "C"}
+
+    def _executable(self, name: str) -> str:
+        """
+        Resolve `name` on PATH once and return its absolute path, so repeated
+        invocations skip the PATH search. Unresolvable names are returned as
+        is and fail with FileNotFoundError when run.
+        """
+        if name not in self._executables:
+            self._executables[name] = shutil.which(name) or name
+        return self._executables[name]
+
+    @classmethod
+    def _check_output(cls, args: list[str]) -> str:
+        output = subprocess.check_output(args, env=cls._tool_env()).decode()
         return output.rstrip("\n")
 
-    def _pkg_config_var(self, var_name: str) -> str:
-        return self._check_output(
-            ["pkg-config", "--variable=" + var_name, self.pkg_name]
-        )
+    @classmethod
+    def _check_outputs(cls, commands: list[list[str]]) -> list[str]:
+        """
+        Run independent commands concurrently and return their outputs in order.
+        Raises like `_check_output` if any of them fails.
+        """
+        env = cls._tool_env()
+        procs: list[subprocess.Popen] = []
+        try:
+            for args in commands:
+                procs.append(
+                    subprocess.Popen(
+                        args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env
+                    )
+                )
+            results = [proc.communicate() for proc in procs]
+        finally:
+            # Don't leave processes behind when starting or reading one failed.
+            for proc in procs:
+                if proc.returncode is None:
+                    proc.kill()
+                    proc.wait()
+        for args, proc, (output, errors) in zip(commands, procs, results):
+            if proc.returncode:
+                # The commands usually fail for the same reason (e.g. "Package
+                # libmapnik was not found"), so show the first one's message only.
+                sys.stderr.write(errors.decode())
+                raise subprocess.CalledProcessError(
+                    proc.returncode, args, output.decode(), errors.decode()
+                )
+        return [output.decode().rstrip("\n") for output, _ in results]
 
     @staticmethod
     def _split_flags(s: str) -> list[str]:
         # pkg-config/mapnik-config return shell-like strings; shlex handles quoted paths safely.
+        # Without quotes or escapes, str.split gives the same result much faster.
+        if '"' not in s and "'" not in s and "\\" not in s:
+            return s.split()
         return [arg for arg in shlex.split(s) if arg]
 
+    def _set_comp_args(self, args: Iterable[str]) -> None:
+        """Replace extra_comp_args, keeping duplicates (flags may take operands)."""
+        self.extra_comp_args = list(args)
+        self._comp_args_set = set(self.extra_comp_args)
+
+    def _append_comp_arg(self, arg: str) -> None:
+        """Append a self-contained flag unless it is already present."""
+        if arg not in self._comp_args_set:
+            self._comp_args_set.add(arg)
+            self.extra_comp_args.append(arg)
+
+    def _remove_comp_args(self, predicate: Callable[[str], bool]) -> None:
+        """Drop the flags matching `predicate`, compacting the list in place."""
+        args = self.extra_comp_args
+        kept = 0
+        for arg in args:
+            if predicate(arg):
+                self._comp_args_set.discard(arg)
+            else:
+                args[kept] = arg
+                kept += 1
+        del args[kept:]
+
+    @staticmethod
+    def _compute_lib_path(prefix: str) -> str:
+        """
+        Mapnik's library directory, `<prefix>/lib/<LIB_DIR_NAME>` (default
+        "mapnik"). A leading slash in LIB_DIR_NAME, as older builds expected,
+        is tolerated.
+        """
+        lib_dir_name = os.environ.get("LIB_DIR_NAME", "").lstrip("/")
+        return os.path.join(prefix, "lib", lib_dir_name or "mapnik")
+
     def _ensure_cpp_std(self) -> None:
         """
         Some environments don't inject a C++ standard in pkg-config/mapnik-config flags.
@@ -49,34 +163,44 @@ class MapnikBuildConfig:
         # (GCC/Clang take the last -std=... argument.)
         if not any(arg.startswith("/std:") for arg in self.extra_comp_args):
             self.extra_comp_args.append("-std=c++17")
+            self._comp_args_set.add("-std=c++17")
 
     def _discover_with_pkg_config(self) -> None:
-        # Linker flags / library location.
-        prefix = self._pkg_config_var("prefix")
-        lib_path = os.path.join(prefix, "lib")
-        self.linkflags.extend(
-            self._split_flags(
-                self._check_output(["pkg-config", "--libs", self.pkg_name])
+        try:
+            variables, cflag_list, lib_list = self._read_pc_files()
+            prefix = variables.get("prefix", "")
+            plugins_dir = variables.get("plugins_dir", "")
+            fonts_dir = variables.get("fonts_dir", "")
+        except (OSError, LookupError):
+            # The .pc files pkg-config resolves here aren't known, so the result
+            # can't be checked for changes (e.g. versioned Homebrew Cellar paths
+            # after `brew upgrade`) and isn't cached.
+            self._cacheable = False
+            # pkg-config only honours one --variable per invocation, so the queries
+            # can't be merged into a single call; run them concurrently instead.
+            pkg_config = self._executable("pkg-config")
+            prefix, libs, plugins_dir, fonts_dir, cflags = self._check_outputs(
+                [
+                    [pkg_config, "--variable=prefix", self.pkg_name],
+                    [pkg_config, "--libs", self.pkg_name],
+                    [pkg_config, "--variable=plugins_dir", self.pkg_name],
+                    [pkg_config, "--variable=fonts_dir", self.pkg_name],
+                    [pkg_config, "--cflags", self.pkg_name],
+                ]
             )
-        )
+            cflag_list = self._split_flags(cflags)
+            lib_list = self._split_flags(libs)
 
-        # Runtime data locations.
-        self.input_plugin_path = self._pkg_config_var("plugins_dir")
-        self.font_path = self._pkg_config_var("fonts_dir")
+        # Linker flags / library location.
+        self.mapnik_lib_path = self._compute_lib_path(prefix)
+        self.linkflags.extend(lib_list)
 
-        lib_dir_name = os.environ.get("LIB_DIR_NAME")
-        if lib_dir_name:
-            self.mapnik_lib_path = lib_path + lib_dir_name
-        else:
-            self.mapnik_lib_path = lib_path + "/mapnik"
+        # Runtime data locations.
+        self.input_plugin_path = plugins_dir
+        self.font_path = fonts_dir
 
         # Compiler flags.
-        extra_comp_args = self._split_flags(
-            self._check_output(["pkg-config", "--cflags", self.pkg_name])
-        )
-        self.extra_comp_args = [
-            arg for arg in extra_comp_args if arg != "-fvisibility=hidden"
-        ]
+        self._set_comp_args(cflag_list)
 
         # Platform-specific path adjustments
         if sys.platform == "darwin":
@@ -86,6 +210,155 @@ class MapnikBuildConfig:
             # Linux: Add system paths if needed
             self._add_linux_system_paths()
 
+    _PC_LINE = re.compile(r"([A-Za-z0-9_.]+)\s*([:=])\s*(.*)")
+    _PC_VARIABLE = re.compile(r"\$\{([A-Za-z0-9_.]+)\}")
+    _PC_OPERATORS = {"<", "<=", "=", "!=", ">=", ">"}
+    _PC_OPERAND_FLAGS = {"-isystem", "-idirafter", "-include", "-framework", "-Xlinker"}
+
+    def _find_pc_file(self, name: str) -> str:
+        for pc_dir in self._pkg_config_search_dirs():
+            pc_file = os.path.join(pc_dir, name + ".pc")
+            if os.path.isfile(pc_file):
+                return pc_file
+        raise LookupError(f"{name}.pc not found in the pkg-config search path")
+
+    def _parse_pc_file(self, pc_file: str) -> tuple[dict[str, str], dict[str, str]]:
+        """
+        Parse a .pc file into its variables (`name=value`, with `${name}`
+        references expanded) and its keyword fields (`Name: value`, keyed in
+        lower case). Raises KeyError on a reference to an undefined variable.
+        """
+        variables = {"pcfiledir": os.path.dirname(pc_file)}
+        fields = {}
+        with open(pc_file, encoding="utf-8") as f_pc:
+            text = f_pc.read().replace("\\\n", " ")
+        for line in text.splitlines():
+            match = self._PC_LINE.match(line.split("#", 1)[0].strip())
+            if not match:
+                continue
+            key, kind, value = match.groups()
+            value = self._PC_VARIABLE.sub(lambda m: variables[m.group(1)], value)
+            if kind == "=":
+                variables[key] = value
+            else:
+                fields[key.lower()] = value
+        return variables, fields
+
+    def _pc_requires(self, requires: str) -> list[str]:
+        """Package names from a Requires field, without version constraints."""
+        names = []
+        tokens = iter(t for t in re.split(r"[\s,]+", requires) if t)
+        for token in tokens:
+            if token in self._PC_OPERATORS:
+                next(tokens, None)
+            else:
+                names.append(token)
+        return names
+
+    def _read_pc_files(self) -> tuple[dict[str, str], list[str], list[str]]:
+        """
+        Resolve `pkg_name` from its .pc file (and those of its Requires) in
+        Python, returning its variables and the flags `pkg-config --cflags`
+        and `pkg-config --libs` would print. This avoids running pkg-config
+        and works when only the .pc files of the target are available.
+
+        Raises LookupError (or OSError) when a .pc file is missing or uses a
+        feature this reader doesn't emulate; callers then run pkg-config.
+        """
+        if os.environ.get("PKG_CONFIG_SYSROOT_DIR"):
+            raise LookupError("PKG_CONFIG_SYSROOT_DIR is not supported")
+        parsed: dict[str, tuple[dict[str, str], dict[str, str]]] = {}
+
+        def load(name: str) -> tuple[dict[str, str], dict[str, str]]:
+            if name not in parsed:
+                pc_file = self._find_pc_file(name)
+                self._pc_files.append(pc_file)
+                parsed[name] = self._parse_pc_file(pc_file)
+            return parsed[name]
+
+        def collect(name: str, field: str, requires: tuple[str, ...]) -> list[str]:
+            # Like pkg-config, walk the whole Requires tree depth-first, each
+            # package's own flags before its requirements', and visit a package
+            # again wherever it is required: `prune` keeps the last occurrence
+            # of a library, so "A: B C" with "B: C" must give "-lA -lB -lC".
+            # Only a package's first and last visit can survive `prune`, so
+            # each walk is reduced to those, which keeps it linear in the
+            # number of packages even for graphs as dense as abseil's.
+            walks: dict[str, list[str]] = {}
+
+            def walk(pkg: str) -> list[str]:
+                if pkg not in walks:
+                    walks[pkg] = []  # Stops a Requires cycle.
+                    fields = load(pkg)[1]
+                    order = [pkg]
+                    for requires_field in requires:
+                        for dep in self._pc_requires(fields.get(requires_field, "")):
+                            order.extend(walk(dep))
+                    first = {}
+                    last = {}
+                    for i, visit in enumerate(order):
+                        first.setdefault(visit, i)
+                        last[visit] = i
+                    walks[pkg] = [
+                        visit
+                        for i, visit in enumerate(order)
+                        if first[visit] == i or last[visit] == i
+                    ]
+                return walks[pkg]
+
+            return [
+                flag
+                for pkg in walk(name)
+                for flag in self._split_flags(load(pkg)[1].get(field, ""))
+            ]
+
+        # Private requirements contribute compiler flags but not (for shared
+        # linking) libraries, as in pkg-config.
+        cflags = collect(self.pkg_name, "cflags", ("requires", "requires.private"))
+        libs = collect(self.pkg_name, "libs", ("requires",))
+
+        # Like pkg-config, drop system -I/-L directories and repeated flags.
+        # Directories keep their first occurrence and other flags their last,
+        # so libraries stay after their dependents.
+        system_flags = set()
+        if "PKG_CONFIG_ALLOW_SYSTEM_CFLAGS" not in os.environ:
+            system_flags.add(("-I/usr/include",))
+        if "PKG_CONFIG_ALLOW_SYSTEM_LIBS" not in os.environ:
+            system_flags.update(
+                ("-L" + lib_dir,)
+                for lib_dir in ["/usr/lib", "/usr/lib64", "/lib", "/lib64"]
+                + [os.path.dirname(d) for d in glob.glob("/usr/lib/*/pkgconfig")]
+            )
+
+        def prune(flags: list[str]) -> list[str]:
+            # Group flags with their separate operand (e.g. "-isystem <dir>").
+            fragments: list[tuple[str, ...]] = []
+            tokens = iter(flags)
+            for token in tokens:
+                if token in self._PC_OPERAND_FLAGS:
+                    fragments.append((token, next(tokens, "")))
+                else:
+                    fragments.append((token,))
+            last = {fragment: i for i, fragment in enumerate(fragments)}
+            seen = set(system_flags)
+            pruned = []
+            for i, fragment in enumerate(fragments):
+                if fragment in seen:
+                    continue
+                directory = fragment[0].startswith(("-I", "-L"))
+                if directory:
+                    seen.add(fragment)
+                elif last[fragment] != i:
+                    continue
+                pruned.extend(fragment)
+            return pruned
+
+        return (
+            load(self.pkg_name)[0],
+            prune(cflags),
+            prune(libs),
+        )
+
     def _mapnik_config(self) -> str:
         # Allow pinning a specific mapnik-config (useful in CI / non-standard prefixes).
         return os.environ.get("MAPNIK_CONFIG", "mapnik-config")
@@ -95,7 +368,7 @@ class MapnikBuildConfig:
         Try mapnik-config with one of the provided flags and return the first
         successful (non-empty) output. Returns "" if none work.
         """
-        cmd = self._mapnik_config()
+        cmd = self._executable(self._mapnik_config())
         for flag in flag_candidates:
             try:
                 out = self._check_output([cmd, flag]).strip()
@@ -105,20 +378,48 @@ class MapnikBuildConfig:
                 return out
         return ""
 
+    def _brew_prefix(self) -> str:
+        """
+        Return the Homebrew prefix. Formula prefixes are `<prefix>/opt/<formula>`,
+        so they are composed rather than queried.
+
+        Starting `brew` boots a Ruby interpreter, so it is only asked when
+        HOMEBREW_PREFIX is unset and brew is in neither default location
+        (/opt/homebrew on Apple Silicon, /usr/local on Intel).
+        """
+        if self._brew_prefix_value is None:
+            prefix = os.environ.get("HOMEBREW_PREFIX", "")
+            if not prefix:
+                defaults = ["/opt/homebrew", "/usr/local"]
+                if platform.machine() != "arm64":
+                    defaults.reverse()
+                prefix = next(
+                    (
+                        p
+                        for p in defaults
+                        if os.path.exists(os.path.join(p, "bin/brew"))
+                    ),
+                    "",
+                )
+            if not prefix:
+                prefix = self._check_output(
+                    [self._executable("brew"), "--prefix"]
+                ).strip()
+            self._brew_prefix_value = prefix
+        return self._brew_prefix_value
+
     def _setup_macos_pkg_config_path(self) -> None:
         """Set up PKG_CONFIG_PATH for macOS Homebrew packages."""
         try:
-            brew_prefix = self._check_output(["brew", "--prefix"]).strip()
+            brew_prefix = self._brew_prefix()
 
             # Add ICU and Mapnik pkg-config paths
             pkg_config_paths = []
 
             # Try to find ICU (could be icu4c or icu4c@version)
-            try:
-                icu_prefix = self._check_output(["brew", "--prefix", "icu4c"]).strip()
+            icu_prefix = os.path.join(brew_prefix, "opt/icu4c")
+            if os.path.exists(icu_prefix):
                 pkg_config_paths.append(os.path.join(icu_prefix, "lib/pkgconfig"))
-            except subprocess.CalledProcessError:
-                pass
 
             # Add Mapnik pkg-config path
             mapnik_prefix = os.path.join(brew_prefix, "opt/mapnik")
@@ -136,50 +437,47 @@ class MapnikBuildConfig:
             # Homebrew not available, skip
             pass
 
+    # Directories whose presence `_add_linux_system_paths` and
+    # `_add_macos_homebrew_paths` (relative to the Homebrew prefix) turn into
+    # flags; part of the build cache key.
+    _LINUX_BOOST_PATHS = ("/usr/include/boost", "/usr/local/include/boost")
+    _HOMEBREW_PATHS = ("opt/boost/include", "opt/harfbuzz/include", "opt/boost/lib")
+
     def _add_linux_system_paths(self) -> None:
         """Add Linux system paths for Boost if needed."""
         # On Linux, most dependencies are in standard locations via system packages.
         # However, we may need to add Boost include paths in some cases.
 
         # Common Boost include locations on Linux
-        boost_search_paths = [
-            "/usr/include/boost",
-            "/usr/local/include/boost",
-        ]
-
-        for boost_path in boost_search_paths:
+        for boost_path in self._LINUX_BOOST_PATHS:
             if os.path.exists(boost_path):
                 parent_dir = os.path.dirname(boost_path)
                 include_flag = f"-I{parent_dir}"
-                if include_flag not in self.extra_comp_args:
-                    self.extra_comp_args.append(include_flag)
+                self._append_comp_arg(include_flag)
                 break
 
     def _add_macos_homebrew_paths(self) -> None:
         """Add macOS Homebrew paths for Boost and fix HarfBuzz include path."""
         try:
             # Get Homebrew prefix
-            brew_prefix = self._check_output(["brew", "--prefix"]).strip()
+            brew_prefix = self._brew_prefix()
 
             # Add Boost include path
             boost_include = os.path.join(brew_prefix, "opt/boost/include")
             if os.path.exists(boost_include):
-                self.extra_comp_args.append(f"-I{boost_include}")
+                self._append_comp_arg(f"-I{boost_include}")
 
             # Fix HarfBuzz include path (Mapnik expects <harfbuzz/hb.h>)
             # The pkg-config gives us -I.../include/harfbuzz but we need -I.../include
-            harfbuzz_prefix = self._check_output(
-                ["brew", "--prefix", "harfbuzz"]
-            ).strip()
+            harfbuzz_prefix = os.path.join(brew_prefix, "opt/harfbuzz")
             harfbuzz_include = os.path.join(harfbuzz_prefix, "include")
             if os.path.exists(harfbuzz_include):
                 # Remove the incorrect harfbuzz include path and add the correct one
-                self.extra_comp_args = [
-                    arg
-                    for arg in self.extra_comp_args
-                    if not (arg.startswith("-I") and arg.endswith("/include/harfbuzz"))
-                ]
-                self.extra_comp_args.append(f"-I{harfbuzz_include}")
+                self._remove_comp_args(
+                    lambda arg: arg.startswith("-I")
+                    and arg.endswith("/include/harfbuzz")
+                )
+                self._append_comp_arg(f"-I{harfbuzz_include}")
 
             # Add Boost library path
             boost_lib = os.path.join(brew_prefix, "opt/boost/lib")
@@ -189,17 +487,29 @@ class MapnikBuildConfig:
             # Homebrew not available or command failed, skip
             pass
 
+    def _add_platform_link_flags(self) -> None:
+        """Add linker flags that only make sense for some platforms."""
+        # $ORIGIN rpaths (for libraries bundled under mapnik/lib) are an ELF
+        # feature; macOS (delocate) and Windows locate bundled libraries differently.
+        if not sys.platform.startswith(
+            ("linux", "freebsd", "netbsd", "openbsd", "sunos")
+        ):
+            return
+        # clock_gettime lives in glibc's librt; musl and the BSDs have no such
+        # split (and no librt to link against).
+        if sys.platform.startswith("linux") and platform.libc_ver()[0] == "glibc":
+            self.linkflags.append("-lrt")
+        self.linkflags.append("-Wl,-z,origin")
+        self.linkflags.append("-Wl,-rpath=$ORIGIN/lib")
+
     def _discover_with_mapnik_config(self) -> None:
-        cmd = self._mapnik_config()
+        cmd = self._executable(self._mapnik_config())
         prefix = self._check_output([cmd, "--prefix"])
-        lib_path = os.path.join(prefix, "lib")
+        self.mapnik_lib_path = self._compute_lib_path(prefix)
 
         # flags
         self.linkflags.extend(self._split_flags(self._check_output([cmd, "--libs"])))
-        extra_comp_args = self._split_flags(self._check_output([cmd, "--cflags"]))
-        self.extra_comp_args = [
-            arg for arg in extra_comp_args if arg != "-fvisibility=hidden"
-        ]
+        self._set_comp_args(self._split_flags(self._check_output([cmd, "--cflags"])))
 
         # runtime locations (best-effort: flags vary slightly across mapnik versions/distros)
         self.input_plugin_path = self._mapnik_config_try_flag(
@@ -209,12 +519,6 @@ class MapnikBuildConfig:
             ["--fonts", "--fonts-dir", "--fonts-path"]
         )
 
-        lib_dir_name = os.environ.get("LIB_DIR_NAME")
-        if lib_dir_name:
-            self.mapnik_lib_path = lib_path + lib_dir_name
-        else:
-            self.mapnik_lib_path = lib_path + "/mapnik"
-
         # Platform-specific path adjustments
         if sys.platform == "darwin":
             # macOS Homebrew: Add Boost and fix HarfBuzz include paths
@@ -223,11 +527,169 @@ class MapnikBuildConfig:
             # Linux: Add system paths if needed
             self._add_linux_system_paths()
 
+    def _pkg_config_search_dirs(self) -> list[str]:
+        """
+        Directories pkg-config would search for .pc files, in order:
+        PKG_CONFIG_PATH, then PKG_CONFIG_LIBDIR or the built-in default path.
+        """
+        dirs = [d for d in os.environ.get("PKG_CONFIG_PATH", "").split(os.pathsep) if d]
+        libdir = os.environ.get("PKG_CONFIG_LIBDIR")
+        if libdir is not None:
+            dirs.extend(d for d in libdir.split(os.pathsep) if d)
+        else:
+            dirs.extend(self._pkg_config_default_dirs())
+        return dirs
+
+    def _pkg_config_default_dirs(self) -> list[str]:
+        """
+        The default search path (`pkg-config --variable pc_path pkg-config`)
+        of the pkg-config a user of this platform runs: Homebrew's on macOS,
+        otherwise the distribution's.
+        """
+        if sys.platform == "darwin":
+            try:
+                brew_prefix = self._brew_prefix()
+            except (FileNotFoundError, subprocess.CalledProcessError):
+                brew_prefix = ""
+            if brew_prefix:
+                dirs = [
+                    os.path.join(brew_prefix, "lib", "pkgconfig"),
+                    os.path.join(brew_prefix, "share", "pkgconfig"),
+                ]
+                if brew_prefix != "/usr/local":
+                    dirs.append("/usr/local/lib/pkgconfig")
+                dirs.append("/usr/lib/pkgconfig")
+                # .pc files Homebrew provides for the libraries macOS ships.
+                release = platform.mac_ver()[0].split(".")
+                version = ".".join(release[:2] if release[0] == "10" else release[:1])
+                if version:
+                    dirs.append(
+                        os.path.join(
+                            brew_prefix, "Library/Homebrew/os/mac/pkgconfig", version
+                        )
+                    )
+                return dirs
+        # /usr/local before /usr, each as lib/<triplet>, lib, then share. Only
+        # this interpreter's multiarch triplet (Debian/Ubuntu) is searched, so
+        # a foreign-architecture -dev package is never picked up. RHEL-family
+        # systems (manylinux) keep 64-bit .pc files in lib64 and 32-bit ones
+        # in lib.
+        triplet = sysconfig.get_config_var("MULTIARCH")
+        dirs = []
+        for prefix in ("/usr/local", "/usr"):
+            if triplet:
+                dirs.append(os.path.join(prefix, "lib", triplet, "pkgconfig"))
+            lib64 = os.path.join(prefix, "lib64", "pkgconfig")
+            if sys.maxsize > 2**32 and os.path.isdir(lib64):
+                dirs.append(lib64)
+            else:
+                dirs.append(os.path.join(prefix, "lib", "pkgconfig"))
+            dirs.append(os.path.join(prefix, "share", "pkgconfig"))
+        return dirs
+
+    @staticmethod
+    def _mtime(path: str | None) -> float | None:
+        try:
+            return os.stat(path).st_mtime if path else None
+        except OSError:
+            return None
+
+    def _cache_key(self) -> str:
+        """
+        Hash everything the discovery result depends on: the environment that
+        steers pkg-config/mapnik-config and the mtimes of the files they read.
+        The .pc files of the Requires are only known after discovery, so the
+        cache stores them separately (see `_load_cache`).
+        """
+        pc_files = [
+            os.path.join(d, self.pkg_name + ".pc")
+            for d in self._pkg_config_search_dirs()
+        ]
+        probed_paths = list(self._LINUX_BOOST_PATHS)
+        if sys.platform == "darwin":
+            try:
+                brew_prefix = self._brew_prefix()
+            except (FileNotFoundError, subprocess.CalledProcessError):
+                brew_prefix = ""
+            if brew_prefix:
+                probed_paths += [
+                    os.path.join(brew_prefix, path) for path in self._HOMEBREW_PATHS
+                ]
+        inputs = {
+            "pkg_name": self.pkg_name,
+            "platform": sys.platform,
+            "env": {
+                name: os.environ.get(name)
+                for name in (
+                    "MAPNIK_CONFIG",
+                    "LIB_DIR_NAME",
+                    "PKG_CONFIG_PATH",
+                    "PKG_CONFIG_LIBDIR",
+                    "PKG_CONFIG_SYSROOT_DIR",
+                    "PKG_CONFIG_ALLOW_SYSTEM_CFLAGS",
+                    "PKG_CONFIG_ALLOW_SYSTEM_LIBS",
+                    "HOMEBREW_PREFIX",
+                )
+            },
+            "pc_files": {f: self._mtime(f) for f in pc_files if os.path.exists(f)},
+            "probed_paths": {path: os.path.exists(path) for path in probed_paths},
+            "mapnik_config": self._mtime(self._executable(self._mapnik_config())),
+            # Discovery logic changes with setup.py itself.
+            "setup_py": self._mtime(os.path.abspath(__file__)),
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode()).hexdigest()
+
+    def _load_cache(self, key: str) -> bool:
+        try:
+            with open(self.cache_file, encoding="utf-8") as f_cache:
+                cached = json.load(f_cache)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(cached, dict) or cached.get("key") != key:
+            return False
+        config = cached.get("config", {})
+        if any(field not in config for field in self._CACHE_FIELDS):
+            return False
+        # Any .pc file read during discovery (libmapnik.pc and the files of
+        # its Requires, e.g. an upgraded icu-uc.pc) must be unchanged.
+        pc_files = cached.get("pc_files", {})
+        if not isinstance(pc_files, dict) or any(
+            self._mtime(pc_file) != mtime for pc_file, mtime in pc_files.items()
+        ):
+            return False
+        for field in self._CACHE_FIELDS:
+            setattr(self, field, config[field])
+        self._comp_args_set = set(self.extra_comp_args)
+        return True
+
+    def _save_cache(self, key: str) -> None:
+        config = {field: getattr(self, field) for field in self._CACHE_FIELDS}
+        pc_files = {pc_file: self._mtime(pc_file) for pc_file in self._pc_files}
+        try:
+            with open(self.cache_file, "w", encoding="utf-8") as f_cache:
+                json.dump(
+                    {"key": key, "config": config, "pc_files": pc_files},
+                    f_cache,
+                    indent=2,
+                )
+        except OSError:
+            # The cache is an optimization only; a read-only tree still builds.
+            pass
+
     def discover(self) -> None:
         # macOS: Set up PKG_CONFIG_PATH for Homebrew packages
         if sys.platform == "darwin":
             self._setup_macos_pkg_config_path()
 
+        # Reuse the previous result when nothing discovery depends on changed.
+        # pip runs setup.py several times per install; set MAPNIK_BUILD_CACHE=0
+        # to always rediscover.
+        use_cache = os.environ.get("MAPNIK_BUILD_CACHE", "1") != "0"
+        cache_key = self._cache_key() if use_cache else ""
+        if use_cache and self._load_cache(cache_key):
+            self.discovered = True
+            return
+
         # Prefer pkg-config, but fall back to mapnik-config (common on some distros/builds).
         try:
             self._discover_with_pkg_config()
@@ -243,103 +705,391 @@ class MapnikBuildConfig:
 
         self._ensure_cpp_std()
 
-        # Platform-specific linker flags.
-        if sys.platform != "darwin":
-            self.linkflags.append("-lrt")
-            self.linkflags.append("-Wl,-z,origin")
-            self.linkflags.append("-Wl,-rpath=$ORIGIN/lib")
+        self._add_platform_link_flags()
 
         self.linkflags = [arg for arg in self.linkflags if arg]
 
+        self.discovered = True
+        if use_cache and self._cacheable:
+            self._save_cache(cache_key)
+
     def write_paths_py(self, target_file: str = "packaging/mapnik/paths.py") -> None:
-        os.makedirs(os.path.dirname(target_file), exist_ok=True)
-        with open(target_file, "w", encoding="utf-8") as f_paths:
-            f_paths.write("import os\n\n")
-            f_paths.write(f"mapniklibpath = {self.mapnik_lib_path!r}\n")
-            f_paths.write(f"inputpluginspath = {self.input_plugin_path!r}\n")
-            f_paths.write(f"fontscollectionpath = {self.font_path!r}\n")
+        content = (
+            "import os\n\n"
+            f"mapniklibpath = {self.mapnik_lib_path!r}\n"
+            f"inputpluginspath = {self.input_plugin_path!r}\n"
+            f"fontscollectionpath = {self.font_path!r}\n"
             # __all__ should be a list of names (strings), not the values.
-            f_paths.write(
-                '__all__ = ["mapniklibpath", "inputpluginspath", "fontscollectionpath"]\n'
-            )
+            '__all__ = ["mapniklibpath", "inputpluginspath", "fontscollectionpath"]\n'
+        )
+        # Leave an up-to-date file alone so its mtime doesn't trigger rebuilds.
+        try:
+            with open(target_file, encoding="utf-8") as f_paths:
+                if f_paths.read() == content:
+                    return
+        except OSError:
+            pass
+        os.makedirs(os.path.dirname(target_file), exist_ok=True)
+        # Write a temporary file and rename it over the target, so an import
+        # racing the build never sees a partially written module.
+        tmp_file = target_file + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f_paths:
+            f_paths.write(content)
+        os.replace(tmp_file, target_file)
+
+
+def compiler_launcher() -> str | None:
+    """
+    Return the ccache/sccache executable used to wrap the compiler, or None.
+    Set MAPNIK_CCACHE=0 to build without one.
+    """
+    if os.environ.get("MAPNIK_CCACHE", "1") == "0" or sys.platform == "win32":
+        return None
+    return shutil.which("ccache") or shutil.which("sccache")
+
+
+def depfile_inputs(obj: str) -> list[str]:
+    """
+    The inputs (source and all headers, system ones included) listed by the
+    dependency file -MD wrote next to `obj`. Raises OSError if there is none.
+    """
+    depfile = os.path.splitext(obj)[0] + ".d"
+    with open(depfile, encoding="utf-8") as f_dep:
+        rules = f_dep.read().replace("\\\n", " ")
+    # "<obj>: <src> <header> ...", with spaces in paths escaped as "\ ".
+    deps = re.split(r"(?<!\\)\s+", rules.partition(": ")[2].strip())
+    return [dep.replace("\\ ", " ") for dep in deps if dep]
+
+
+def depfile_needs_recompile(obj: str, extra_deps: Iterable[str] = ()) -> bool:
+    """
+    Recompile `obj` unless its depfile inputs and `extra_deps` are all older
+    than the object itself.
+    """
+    try:
+        obj_mtime = os.stat(obj).st_mtime
+        return any(
+            os.stat(dep).st_mtime > obj_mtime
+            for dep in [*depfile_inputs(obj), *extra_deps]
+        )
+    except OSError:
+        return True
+
+
+def command_digest(command: list[str]) -> str:
+    return hashlib.sha256("\0".join(command).encode()).hexdigest()
+
+
+def is_up_to_date(obj: str, command: list[str], extra_deps: Iterable[str] = ()) -> bool:
+    """
+    True if `obj` was built by exactly `command` (as recorded in <obj>.cmd by
+    `record_command`) and none of its depfile inputs or `extra_deps` changed
+    since.
+    """
+    try:
+        with open(obj + ".cmd", encoding="utf-8") as f_cmd:
+            recorded = f_cmd.read()
+    except OSError:
+        return False
+    return recorded == command_digest(command) and not depfile_needs_recompile(
+        obj, extra_deps
+    )
+
+
+def record_command(obj: str, command: list[str]) -> None:
+    with open(obj + ".cmd", "w", encoding="utf-8") as f_cmd:
+        f_cmd.write(command_digest(command))
 
 
+# Discovery runs on first use by a build command (see `prepare_build_config`),
+# so metadata-only invocations (egg_info, dist_info, sdist, --version, ...)
+# neither probe for Mapnik nor rewrite paths.py.
 cfg = MapnikBuildConfig("libmapnik")
-cfg.discover()
-cfg.write_paths_py()
+launcher = compiler_launcher()
+
+
+def prepare_build_config() -> MapnikBuildConfig:
+    if not cfg.discovered:
+        cfg.discover()
+        cfg.write_paths_py()
+    return cfg
+
+
+class MapnikBuildPy(build_py):
+    """build_py that generates mapnik/paths.py before the modules are collected."""
+
+    def run(self):
+        prepare_build_config()
+        super().run()
+
+
+class MapnikBuildExt(build_ext):
+    """build_ext that applies the discovered Mapnik flags to each extension."""
+
+    # Flags and dependencies each extension was declared with, by extension name.
+    _declared_args: dict[str, tuple[list[str], list[str], list[str]]] = {}
+    # Cached result of `_is_clang`.
+    _clang: bool | None = None
+
+    def run(self):
+        # Also covers `build_ext --inplace`, which doesn't run build_py.
+        prepare_build_config()
+        for ext in self.extensions:
+            # Start from the declared flags, so running build_ext again in the
+            # same process (reinitialize_command + run_command) doesn't add
+            # every flag a second time.
+            declared = self._declared_args.setdefault(
+                ext.name,
+                (
+                    list(ext.extra_compile_args),
+                    list(ext.extra_link_args),
+                    list(ext.depends),
+                ),
+            )
+            ext.extra_compile_args = list(declared[0])
+            ext.extra_link_args = list(declared[1])
+            ext.depends = list(declared[2])
+            ext.extra_compile_args.extend(cfg.extra_comp_args)
+            ext.extra_link_args.extend(cfg.linkflags)
+            if launcher:
+                # Keep the absolute build directory out of the objects so cache
+                # entries are shared between checkouts.
+                ext.extra_compile_args.append(f"-fdebug-prefix-map={os.getcwd()}=.")
+        super().run()
+
+    def build_extensions(self):
+        optimize = not self.debug and os.environ.get("MAPNIK_DEBUG", "0") != "1"
+        if self.compiler.compiler_type == "msvc":
+            if optimize:
+                for ext in self.extensions:
+                    ext.extra_compile_args.extend(["/O2", "/GL"])
+                    ext.extra_link_args.append("/LTCG")
+        elif self.compiler.compiler_type == "unix":
+            # Precompiled headers, which the depfiles of the objects built
+            # with them don't list.
+            self._pch_files: list[str] = []
+            self._skip_up_to_date_objects()
+            for ext in self.extensions:
+                if optimize:
+                    # Pybind11Extension already compiles with -fvisibility=hidden;
+                    # also hide inline functions and template instantiations. LTO
+                    # lets the compiler inline across all sources.
+                    lto = "-flto=thin" if self._is_clang() else "-flto=auto"
+                    ext.extra_compile_args.extend(
+                        ["-O3", "-DNDEBUG", "-fvisibility-inlines-hidden", lto]
+                    )
+                    ext.extra_link_args.append(lto)
+                # Have GCC/Clang write <obj>.d for depfile_needs_recompile. -MD
+                # rather than -MMD, so an upgraded Mapnik in /usr/include or
+                # /usr/local/include rebuilds every source that includes it.
+                ext.extra_compile_args.append("-MD")
+                if os.environ.get("MAPNIK_PCH", "0") == "1":
+                    self._use_precompiled_header(ext)
+                self._add_build_inputs(ext)
+        super().build_extensions()
+
+    def _add_build_inputs(self, ext) -> None:
+        """
+        build_ext skips an extension whose sources and `depends` are all
+        older than the built module, before any object is checked. Add to
+        `depends` a stamp of the compile and link settings, rewritten only
+        when they change, and every input the objects' depfiles list, so a
+        new flag or an upgraded system header gets past that check.
+        """
+        compiler = self.compiler
+        settings = {
+            "compiler": [
+                compiler.compiler_so,
+                compiler.compiler_so_cxx,
+                compiler.linker_so,
+                compiler.linker_so_cxx,
+                compiler.macros,
+                compiler.include_dirs,
+                compiler.library_dirs,
+                compiler.libraries,
+            ],
+            "ext": [
+                ext.extra_compile_args,
+                ext.extra_link_args,
+                ext.define_macros,
+                ext.undef_macros,
+                ext.include_dirs,
+                ext.library_dirs,
+                ext.libraries,
+                ext.runtime_library_dirs,
+            ],
+            # compiler_fixup rewrites -arch from it on macOS.
+            "archflags": os.environ.get("ARCHFLAGS"),
+        }
+        stamp = os.path.join(self.build_temp, ext.name + ".flags")
+        digest = hashlib.sha256(json.dumps(settings).encode()).hexdigest()
+        try:
+            with open(stamp, encoding="utf-8") as f_stamp:
+                unchanged = f_stamp.read() == digest
+        except OSError:
+            unchanged = False
+        if not unchanged:
+            os.makedirs(self.build_temp, exist_ok=True)
+            with open(stamp, "w", encoding="utf-8") as f_stamp:
+                f_stamp.write(digest)
+        ext.depends.append(stamp)
+        ext.depends.extend(self._pch_files)
+        objects = compiler.object_filenames(ext.sources, output_dir=self.build_temp)
+        for obj in objects + self._pch_files:
+            try:
+                ext.depends.extend(depfile_inputs(obj))
+            except OSError:
+                # Not built yet; build_ext then builds the module anyway.
+                pass
+
+    def _skip_up_to_date_objects(self) -> None:
+        """
+        Wrap the compiler so a source is only recompiled when its object was
+        built by a different command (compiler, flags, defines, include dirs)
+        or one of the files it includes changed. build_ext --force always
+        recompiles.
+        """
+        compiler = self.compiler
+        compile_one = compiler._compile
+        force = self.force
+
+        def _compile(obj, src, ext, cc_args, extra_postargs, pp_opts):
+            if compiler.detect_language(src) == "c++":
+                command = list(compiler.compiler_so_cxx)
+            else:
+                command = list(compiler.compiler_so)
+            # What UnixCCompiler._compile runs, -arch/-isysroot fixups included.
+            command = compiler_fixup(command, cc_args + extra_postargs)
+            command += pp_opts + cc_args + extra_postargs
+            if not force and is_up_to_date(obj, command, self._pch_files):
+                return
+            # Drop the old record first so a failed compile can't leave a
+            # stale object that looks up to date.
+            if os.path.exists(obj + ".cmd"):
+                os.remove(obj + ".cmd")
+            compile_one(obj, src, ext, cc_args, extra_postargs, pp_opts)
+            record_command(obj, command)
+
+        compiler._compile = _compile
+
+    def _is_clang(self) -> bool:
+        """
+        Whether the C++ compiler is Clang. A name like clang++ or g++-14 is
+        enough; generic names (c++, or a CXX wrapper) are resolved by asking
+        the compiler, since c++ is Apple Clang on macOS but GCC on most Linux
+        systems and Homebrew GCC is just as usable on macOS.
+        """
+        if self._clang is None:
+            command = self.compiler.compiler_so_cxx
+            # Look past a ccache/sccache launcher to the compiler itself.
+            if len(command) > 1 and os.path.basename(command[0]) in (
+                "ccache",
+                "sccache",
+            ):
+                command = command[1:]
+            name = os.path.basename(command[0])
+            if "clang" in name:
+                self._clang = True
+            elif "gcc" in name or "g++" in name:
+                self._clang = False
+            else:
+                try:
+                    version = MapnikBuildConfig._check_output([command[0], "--version"])
+                except (OSError, subprocess.CalledProcessError):
+                    version = ""
+                self._clang = "clang" in version
+        return self._clang
+
+    def _use_precompiled_header(self, ext, header: str = "src/pybind_pch.hpp"):
+        """
+        Compile `header` once with the extension's flags and force-include it
+        into every translation unit, so the pybind11/Mapnik headers it lists
+        are parsed once instead of once per source.
+        """
+        # The compiler looks for <header>.gch (GCC) or <header>.pch (Clang)
+        # next to the file named by -include.
+        pch_header = os.path.join(self.build_temp, os.path.basename(header))
+        pch = pch_header + (".pch" if self._is_clang() else ".gch")
+        os.makedirs(self.build_temp, exist_ok=True)
+        self.copy_file(header, pch_header)
+        pp_opts = gen_preprocess_options(
+            self.compiler.macros + ext.define_macros,
+            ext.include_dirs + self.compiler.include_dirs,
+        )
+        # Fix up -arch/-isysroot as UnixCCompiler._compile does for the
+        # sources (ARCHFLAGS on macOS), so the PCH targets the same architecture.
+        compiler_so_cxx = compiler_fixup(
+            self.compiler.compiler_so_cxx, pp_opts + ext.extra_compile_args
+        )
+        command = (
+            compiler_so_cxx
+            + pp_opts
+            + ["-x", "c++-header", pch_header, "-o", pch]
+            + ext.extra_compile_args
+        )
+        if self.force or not is_up_to_date(pch, command):
+            # spawn resolves the executable in place; record what was asked for.
+            self.compiler.spawn(list(command))
+            record_command(pch, command)
+        self._pch_files.append(pch)
+        ext.extra_compile_args.extend(["-Winvalid-pch", "-include", pch_header])
+
+
+def read_sources(list_file: str) -> list[str]:
+    """
+    The source files named in `list_file`, one per line, relative to it.
+    `list_file` and the result are relative to the project directory, which
+    is the working directory when setup.py runs (but not when it is imported).
+    """
+    base = os.path.dirname(list_file)
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(project_dir, list_file), encoding="utf-8") as f_list:
+        lines = [line.strip() for line in f_list]
+    return [f"{base}/{line}" for line in lines if line and not line.startswith("#")]
+
 
 ext_modules = [
     Pybind11Extension(
         "mapnik._mapnik",
-        [
-            "src/mapnik_python.cpp",
-            "src/mapnik_layer.cpp",
-            "src/mapnik_query.cpp",
-            "src/mapnik_map.cpp",
-            "src/mapnik_color.cpp",
-            "src/mapnik_composite_modes.cpp",
-            "src/mapnik_coord.cpp",
-            "src/mapnik_envelope.cpp",
-            "src/mapnik_expression.cpp",
-            "src/mapnik_datasource.cpp",
-            "src/mapnik_datasource_cache.cpp",
-            "src/mapnik_gamma_method.cpp",
-            "src/mapnik_geometry.cpp",
-            "src/mapnik_feature.cpp",
-            "src/mapnik_featureset.cpp",
-            "src/mapnik_font_engine.cpp",
-            "src/mapnik_fontset.cpp",
-            "src/mapnik_grid.cpp",
-            "src/mapnik_grid_view.cpp",
-            "src/mapnik_image.cpp",
-            "src/mapnik_image_view.cpp",
-            "src/mapnik_projection.cpp",
-            "src/mapnik_proj_transform.cpp",
-            "src/mapnik_rule.cpp",
-            "src/mapnik_symbolizer.cpp",
-            "src/mapnik_debug_symbolizer.cpp",
-            "src/mapnik_markers_symbolizer.cpp",
-            "src/mapnik_polygon_symbolizer.cpp",
-            "src/mapnik_polygon_pattern_symbolizer.cpp",
-            "src/mapnik_line_symbolizer.cpp",
-            "src/mapnik_line_pattern_symbolizer.cpp",
-            "src/mapnik_point_symbolizer.cpp",
-            "src/mapnik_raster_symbolizer.cpp",
-            "src/mapnik_scaling_method.cpp",
-            "src/mapnik_style.cpp",
-            "src/mapnik_logger.cpp",
-            "src/mapnik_placement_finder.cpp",
-            "src/mapnik_text_symbolizer.cpp",
-            "src/mapnik_palette.cpp",
-            "src/mapnik_parameters.cpp",
-            "src/python_grid_utils.cpp",
-            "src/mapnik_raster_colorizer.cpp",
-            "src/mapnik_label_collision_detector.cpp",
-            "src/mapnik_dot_symbolizer.cpp",
-            "src/mapnik_building_symbolizer.cpp",
-            "src/mapnik_shield_symbolizer.cpp",
-            "src/mapnik_group_symbolizer.cpp",
-        ],
+        # Shared with CMakeLists.txt.
+        read_sources("src/sources.txt"),
+        # Headers participate in build_ext's up-to-date check of the extension.
+        depends=["src/sources.txt", *sorted(glob.glob("src/*.hpp"))],
         cxx_std=17,
-        extra_compile_args=cfg.extra_comp_args,
-        extra_link_args=cfg.linkflags,
     )
 ]
 
-if os.environ.get("CC", False) == False:
-    os.environ["CC"] = "c++"
-if os.environ.get("CXX", False) == False:
-    os.environ["CXX"] = "c++"
-
-setup(
-    name="mapnik",
-    version="4.2.0.dev",
-    packages=find_packages(where="packaging"),
-    package_dir={"": "packaging"},
-    package_data={
-        "mapnik": ["lib/*.*", "lib/*/*/*", "share/*/*"],
-    },
-    ext_modules=ext_modules,
-    cmdclass={"build_ext": build_ext},
-    python_requires=">=3.7",
-)
+# Everything below configures and runs the build. setup.py is executed as
+# __main__ by setuptools and pip; importing it (as the tests do) only defines
+# the helpers above.
+if __name__ == "__main__":
+    # setuptools compiles and links C++ sources with CXX (and CC only for C), so
+    # leave CC to the environment and only default CXX, treating "" as unset.
+    if not os.environ.get("CXX"):
+        os.environ["CXX"] = "c++"
+
+    # Route compiles through ccache/sccache unless the compiler is already wrapped.
+    if launcher:
+        for var in ("CC", "CXX"):
+            command = os.environ.get(var, "").split()
+            if command and os.path.basename(command[0]) not in ("ccache", "sccache"):
+                os.environ[var] = f"{launcher} {os.environ[var]}"
+
+    # Compile the translation units of the extension concurrently. build_ext's own
+    # `parallel` option only fans out across extensions, and we build exactly one.
+    # MAX_JOBS caps the thread count; unset means one thread per CPU.
+    ParallelCompile("MAX_JOBS").install()
+
+    setup(
+        name="mapnik",
+        version="4.2.0.dev",
+        # Spelled out (rather than find_packages) to skip walking the tree on every run.
+        packages=["mapnik", "mapnik.printing"],
+        package_dir={"": "packaging"},
+        package_data={
+            "mapnik": ["lib/*.*", "lib/*/*/*", "share/*/*"],
+        },
+        ext_modules=ext_modules,
+        cmdclass={"build_py": MapnikBuildPy, "build_ext": MapnikBuildExt},
+        python_requires=">=3.7",
+    )
@@ -0,0 +1,40 @@
+/*****************************************************************************
+ *
+ * This file is part of Mapnik (c++ mapping toolkit)
+ *
+ * Copyright (C) 2024 Artem Pavlenko
+ *
+ * This library is free software; you can redistribute it and/or
+ * modify it under the terms of the GNU Lesser General Public
+ * License as published by the Free Software Foundation; either
+ * version 2.1 of the License, or (at your option) any later version.
+ *
+ * This library is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+ * Lesser General Public License for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public
+ * License along with this library; if not, write to the Free Software
+ * Foundation, Inc., 51 Franklin St, Fifth Floor, Boston, MA  02110-1301  USA
+ *
+ *****************************************************************************/
+
+// Precompiled header for the extension, enabled with MAPNIK_PCH=1 (see setup.py).
+// Only list headers that are safe to see in every translation unit: nothing
+// that declares PYBIND11_MAKE_OPAQUE or custom type casters, and not
+// <pybind11/stl.h>, which changes how containers are converted.
+
+#ifndef MAPNIK_PYBIND_PCH_INCLUDED
+#define MAPNIK_PYBIND_PCH_INCLUDED
+
+#include <mapnik/config.hpp>
+//pybind11
+#include <pybind11/pybind11.h>
+//mapnik
+#include <mapnik/symbolizer.hpp>
+#include <mapnik/symbolizer_hash.hpp>
+#include <mapnik/symbolizer_keys.hpp>
+#include <mapnik/symbolizer_utils.hpp>
+
+#endif // MAPNIK_PYBIND_PCH_INCLUDED
@@ -0,0 +1,156 @@
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("pybind11.setup_helpers")
+
+SETUP_PY = os.path.join(os.path.dirname(__file__), "..", "..", "setup.py")
+if not os.path.exists(SETUP_PY):
+    pytest.skip("setup.py is not available", allow_module_level=True)
+
+
+def load_setup():
+    spec = importlib.util.spec_from_file_location("mapnik_setup", SETUP_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+build = load_setup()
+
+
+@pytest.fixture
+def pc_dir(tmp_path, monkeypatch):
+    # Only search tmp_path, so results don't depend on the host's .pc files.
+    monkeypatch.setenv("PKG_CONFIG_PATH", str(tmp_path))
+    monkeypatch.setenv("PKG_CONFIG_LIBDIR", "")
+    for name in (
+        "PKG_CONFIG_SYSROOT_DIR",
+        "PKG_CONFIG_ALLOW_SYSTEM_CFLAGS",
+        "PKG_CONFIG_ALLOW_SYSTEM_LIBS",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    return tmp_path
+
+
+def write_pc(pc_dir, name, variables="", **fields):
+    lines = [variables, f"Name: {name}", "Description: test", "Version: 1.0"]
+    lines += [f"{key.replace('_', '.')}: {value}" for key, value in fields.items()]
+    (pc_dir / f"{name}.pc").write_text("\n".join(lines) + "\n")
+
+
+def read(name):
+    return build.MapnikBuildConfig(name)._read_pc_files()
+
+
+def pkg_config(pc_dir, *args):
+    env = {**os.environ, "PKG_CONFIG_PATH": str(pc_dir), "PKG_CONFIG_LIBDIR": ""}
+    return subprocess.check_output(["pkg-config", *args], env=env, text=True).split()
+
+
+def test_libraries_follow_every_package_requiring_them(pc_dir):
+    write_pc(pc_dir, "a", Requires="c, b", Libs="-la")
+    write_pc(pc_dir, "b", Requires="c", Libs="-lb")
+    write_pc(pc_dir, "c", Libs="-lc")
+    assert read("a")[2] == ["-la", "-lb", "-lc"]
+
+
+def test_private_requires_only_add_compiler_flags(pc_dir):
+    write_pc(pc_dir, "a", Requires_private="p >= 1.0", Cflags="-DA", Libs="-la")
+    write_pc(pc_dir, "p", Cflags="-DP", Libs="-lp")
+    _, cflags, libs = read("a")
+    assert cflags == ["-DA", "-DP"]
+    assert libs == ["-la"]
+
+
+def test_variables_are_expanded(pc_dir):
+    write_pc(
+        pc_dir,
+        "a",
+        variables="prefix=/opt/a\nplugins_dir=${prefix}/lib/input",
+        Cflags="-I${prefix}/include",
+    )
+    variables, cflags, _ = read("a")
+    assert variables["plugins_dir"] == "/opt/a/lib/input"
+    assert cflags == ["-I/opt/a/include"]
+
+
+def test_system_directories_and_repeated_flags_are_dropped(pc_dir, monkeypatch):
+    write_pc(
+        pc_dir, "a", Requires="b", Cflags="-I/usr/include -DA", Libs="-L/usr/lib -la"
+    )
+    write_pc(pc_dir, "b", Cflags="-DA -I/opt/b", Libs="-la -lb")
+    _, cflags, libs = read("a")
+    assert cflags == ["-DA", "-I/opt/b"]
+    assert libs == ["-la", "-lb"]
+    monkeypatch.setenv("PKG_CONFIG_ALLOW_SYSTEM_CFLAGS", "1")
+    assert read("a")[1] == ["-I/usr/include", "-DA", "-I/opt/b"]
+
+
+def test_missing_requires_raise_lookup_error(pc_dir):
+    write_pc(pc_dir, "a", Requires="missing")
+    with pytest.raises(LookupError):
+        read("a")
+
+
+def test_pkg_config_path_is_searched_in_order(pc_dir, tmp_path_factory, monkeypatch):
+    later = tmp_path_factory.mktemp("later")
+    write_pc(pc_dir, "a", Cflags="-DFIRST")
+    write_pc(later, "a", Cflags="-DLATER")
+    monkeypatch.setenv("PKG_CONFIG_PATH", os.pathsep.join([str(later), str(pc_dir)]))
+    assert read("a")[1] == ["-DLATER"]
+
+
+@pytest.mark.parametrize("lib64", [False, True])
+def test_default_path_only_searches_own_triplet(monkeypatch, lib64):
+    monkeypatch.setattr(build.sys, "platform", "linux")
+    monkeypatch.setattr(build.sys, "maxsize", 2**63 - 1)
+    monkeypatch.setattr(
+        build.sysconfig, "get_config_var", lambda name: "x86_64-linux-gnu"
+    )
+    monkeypatch.setattr(build.os.path, "isdir", lambda path: lib64)
+    lib = "lib64/pkgconfig" if lib64 else "lib/pkgconfig"
+    assert build.MapnikBuildConfig()._pkg_config_default_dirs() == [
+        "/usr/local/lib/x86_64-linux-gnu/pkgconfig",
+        f"/usr/local/{lib}",
+        "/usr/local/share/pkgconfig",
+        "/usr/lib/x86_64-linux-gnu/pkgconfig",
+        f"/usr/{lib}",
+        "/usr/share/pkgconfig",
+    ]
+
+
+needs_pkg_config = pytest.mark.skipif(
+    not shutil.which("pkg-config") or not sys.platform.startswith("linux"),
+    reason="compares against the host's pkg-config",
+)
+
+
+@needs_pkg_config
+def test_default_path_matches_pkg_config():
+    pc_path = subprocess.check_output(
+        ["pkg-config", "--variable", "pc_path", "pkg-config"], text=True
+    )
+    expected = pc_path.strip().split(os.pathsep)
+    ours = build.MapnikBuildConfig()._pkg_config_default_dirs()
+    # Directories both search are searched in the same order.
+    common = [d for d in ours if d in expected]
+    assert common == [d for d in expected if d in ours]
+    assert common
+
+
+@needs_pkg_config
+def test_flags_match_pkg_config(pc_dir):
+    write_pc(
+        pc_dir, "a", Requires="c, b", Requires_private="p", Cflags="-DA", Libs="-la"
+    )
+    write_pc(pc_dir, "b", Requires="c", Cflags="-I/opt/b -DB", Libs="-L/opt/b -lb")
+    write_pc(pc_dir, "c", Cflags="-I/opt/b -DC", Libs="-L/opt/c -lc -lm")
+    write_pc(pc_dir, "p", Cflags="-DP", Libs="-lp")
+    _, cflags, libs = read("a")
+    assert cflags == pkg_config(pc_dir, "--cflags", "a")
+    assert libs == pkg_config(pc_dir, "--libs", "a")